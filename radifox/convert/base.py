@@ -31,6 +31,7 @@ from .utils import (
     get_software_versions,
     shift_date,
     parse_dcm2niix_suffixes,
+    cached_input_hash,
 )
 from ._version import __version__
 
@@ -539,7 +540,9 @@ class BaseSet:
         self.ConversionSoftwareVersions = get_software_versions()
         if input_hash is None:
             logging.info("Hashing source file(s) for record keeping.")
-            self.InputHash = hash_file_dir(source, False)
+            self.InputHash = cached_input_hash(
+                source, output_root / metadata_obj.dir_to_str() / ".radifox_inputhash"
+            )
             logging.info("Hashing complete.")
         else:
             logging.info("Using existing source hash for record keeping.")
@@ -856,10 +859,11 @@ class BaseSet:
         source_dict = defaultdict(list)
         for di in self.SeriesList:
             source_dict[di.SourcePath].append(di)
+        session_dir = self.OutputRoot / self.Metadata.dir_to_str()
         for source_path, di_list in source_dict.items():
             if any(di.ConvertImage for di in di_list):
                 logging.info("Creating Nifti for %s" % source_path)
-                create_nii(self.OutputRoot / self.Metadata.dir_to_str(), source_path, di_list)
+                create_nii(session_dir, source_path, di_list)
                 for di in di_list:
                     if di.ConvertImage:
                         self.generate_sidecar(di)
@@ -872,9 +876,8 @@ class BaseSet:
         )
 
     def generate_sidecar(self, di_obj: BaseInfo) -> None:
-        sidecar_file = (
-            self.OutputRoot / self.Metadata.dir_to_str() / "nii" / (di_obj.NiftiName + ".json")
-        )
+        session_dir = self.OutputRoot / self.Metadata.dir_to_str()
+        sidecar_file = session_dir / "nii" / (di_obj.NiftiName + ".json")
         logging.info("Writing image sidecar file to %s" % sidecar_file)
         out_dict = {k: v for k, v in self.__repr_json__().items() if k not in "SeriesList"}
         out_dict["SeriesInfo"] = di_obj
@@ -885,21 +888,17 @@ class BaseSet:
         )
 
     def generate_qa_image(self, di_obj: BaseInfo) -> None:
-        qa_dir = self.OutputRoot / self.Metadata.dir_to_str() / "qa" / "conversion"
-        nifti_file = (
-            self.OutputRoot / self.Metadata.dir_to_str() / "nii" / (di_obj.NiftiName + ".nii.gz")
-        )
+        session_dir = self.OutputRoot / self.Metadata.dir_to_str()
+        qa_dir = session_dir / "qa" / "conversion"
+        nifti_file = session_dir / "nii" / (di_obj.NiftiName + ".nii.gz")
         qa_file = qa_dir / (di_obj.NiftiName + ".png")
         logging.info("Creating QA image for %s" % nifti_file)
         mkdir_p(qa_dir)
         create_qa_image(nifti_file, qa_file)
 
     def generate_unconverted_info(self) -> None:
-        info_file = (
-            self.OutputRoot
-            / self.Metadata.dir_to_str()
-            / (self.Metadata.prefix_to_str() + "_UnconvertedInfo.json")
-        )
+        session_dir = self.OutputRoot / self.Metadata.dir_to_str()
+        info_file = session_dir / (self.Metadata.prefix_to_str() + "_UnconvertedInfo.json")
         logging.info("Writing unconverted info file to %s" % info_file)
         out_dict = {k: v for k, v in self.__repr_json__().items() if k not in "SeriesList"}
         out_dict["SeriesList"] = [item for item in self.SeriesList if not item.NiftiCreated]
@@ -1,20 +1,19 @@
 import argparse
 import json
 import logging
+import os
 from pathlib import Path
 import shutil
 from typing import List, Optional
 
-from radifox.records.hashing import hash_file_dir
-
 from ._version import __version__
 from .exec import run_conversion, ExecError
 from .lut import LookupTable
 from .metadata import Metadata
-from .utils import silentremove, mkdir_p, version_check
+from .utils import silentremove, mkdir_p, version_check, cached_input_hash
 
 
-def convert(args: Optional[List[str]] = None) -> None:
+def _build_convert_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser()
     parser.add_argument("source", type=Path, help="Source directory/file to convert.")
     parser.add_argument(
@@ -64,8 +63,14 @@ def convert(args: Optional[List[str]] = None) -> None:
     parser.add_argument("--anonymize", action="store_true", help="Anonymize DICOM data.")
     parser.add_argument("--date-shift-days", type=int, help="Number of days to shift dates.")
     parser.add_argument("--version", action="version", version="%(prog)s " + __version__)
+    return parser
+
+
+_CONVERT_PARSER = _build_convert_parser()
 
-    args = parser.parse_args(args)
+
+def convert(args: Optional[List[str]] = None) -> None:
+    args = _CONVERT_PARSER.parse_args(args)
 
     for argname in ["source", "output_root", "lut_file", "tms_metafile"]:
         if getattr(args, argname) is not None:
@@ -104,24 +109,21 @@ def convert(args: Optional[List[str]] = None) -> None:
     else:
         lut_file = args.lut_file
 
-    manual_json_file = (
-        args.output_root / metadata.dir_to_str() / (metadata.prefix_to_str() + "_ManualNaming.json")
-    )
+    session_dir = args.output_root / metadata.dir_to_str()
+    prefix = metadata.prefix_to_str()
+    manual_json_file = session_dir / (prefix + "_ManualNaming.json")
     manual_names = json.loads(manual_json_file.read_text()) if manual_json_file.exists() else {}
 
     type_dirname = "%s" % "parrec" if args.parrec else "dcm"
-    if (args.output_root / metadata.dir_to_str() / type_dirname).exists():
+    input_hash = None
+    if (session_dir / type_dirname).exists():
         if args.safe:
             metadata.AttemptNum = 2
             while (args.output_root / metadata.dir_to_str() / type_dirname).exists():
                 metadata.AttemptNum += 1
         elif args.force or args.reckless:
             if not args.reckless:
-                json_file = (
-                    args.output_root
-                    / metadata.dir_to_str()
-                    / (metadata.prefix_to_str() + "_UnconvertedInfo.json")
-                )
+                json_file = session_dir / (prefix + "_UnconvertedInfo.json")
                 if not json_file.exists():
                     raise ValueError(
                         "Unconverted info file (%s) does not exist for consistency checking. "
@@ -147,14 +149,17 @@ def convert(args: Optional[List[str]] = None) -> None:
                         "Previous conversion used a TMS metadata file, "
                         "run with --reckless to ignore this error."
                     )
-                if hash_file_dir(args.source, False) != json_obj["InputHash"]:
+                input_hash = cached_input_hash(args.source, session_dir / ".radifox_inputhash")
+                if input_hash != json_obj["InputHash"]:
                     raise ValueError(
                         "Source file(s) have changed since last conversion, "
                         "run with --reckless to ignore this error."
                     )
-            shutil.rmtree(args.output_root / metadata.dir_to_str() / type_dirname)
-            silentremove(args.output_root / metadata.dir_to_str() / "nii")
-            for filepath in (args.output_root / metadata.dir_to_str()).glob("*.json"):
+            shutil.rmtree(session_dir / type_dirname)
+            silentremove(session_dir / "nii")
+            with os.scandir(session_dir) as entries:
+                json_files = [Path(entry.path) for entry in entries if entry.name.endswith(".json")]
+            for filepath in json_files:
                 silentremove(filepath)
         else:
             raise RuntimeError(
@@ -180,12 +185,12 @@ def convert(args: Optional[List[str]] = None) -> None:
         args.anonymize,
         args.date_shift_days,
         manual_names,
-        None,
+        input_hash,
         args.force_derived,
     )
 
 
-def update(args: Optional[List[str]] = None) -> None:
+def _build_update_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser()
     parser.add_argument("directory", type=Path, help="Existing RADIFOX Directory to update.")
     parser.add_argument("-l", "--lut-file", type=Path, help="Lookup table file.")
@@ -194,8 +199,14 @@ def update(args: Optional[List[str]] = None) -> None:
     )
     parser.add_argument("--verbose", action="store_true", help="Verbose output.")
     parser.add_argument("--version", action="version", version="%(prog)s " + __version__)
+    return parser
+
 
-    args = parser.parse_args(args)
+_UPDATE_PARSER = _build_update_parser()
+
+
+def update(args: Optional[List[str]] = None) -> None:
+    args = _UPDATE_PARSER.parse_args(args)
 
     session_id = args.directory.name
     subj_id = args.directory.parent.name
@@ -228,33 +239,36 @@ def update(args: Optional[List[str]] = None) -> None:
             lut_file = output_root / metadata.projectname / (metadata.projectname + "-lut.csv")
     else:
         lut_file = args.lut_file
-    lookup_dict = (
-        LookupTable(lut_file, metadata.ProjectID, metadata.SiteID).LookupDict
-        if lut_file.exists()
-        else {}
-    )
 
     manual_json_file = args.directory / (metadata.prefix_to_str() + "_ManualNaming.json")
     manual_names = json.loads(manual_json_file.read_text()) if manual_json_file.exists() else {}
 
-    if not args.force and (
-        version_check(json_obj["__version__"]["radifox"], __version__)
-        and json_obj["LookupTable"]["LookupDict"] == lookup_dict
-        and json_obj["ManualNames"] == manual_names
-    ):
-        print(
-            "No action required. Software version, LUT dictionary and naming dictionary match for %s."
-            % args.directory
+    # Only parse the LUT when the version matches, otherwise we re-run regardless
+    if not args.force and version_check(json_obj["__version__"]["radifox"], __version__):
+        lookup_dict = (
+            LookupTable(lut_file, metadata.ProjectID, metadata.SiteID).LookupDict
+            if lut_file.exists()
+            else {}
         )
-        return
+        if (
+            json_obj["LookupTable"]["LookupDict"] == lookup_dict
+            and json_obj["ManualNames"] == manual_names
+        ):
+            print(
+                "No action required. Software version, LUT dictionary and naming dictionary "
+                "match for %s." % args.directory
+            )
+            return
 
-    parrec = (args.directory / "parrec").exists()
+    with os.scandir(args.directory) as entries:
+        dir_names = {entry.name for entry in entries}
+    parrec = "parrec" in dir_names
     type_dir = args.directory / ("%s" % "parrec" if parrec else "dcm")
 
     mkdir_p(args.directory / "prev")
-    for filename in ["nii", "qa", json_file.name]:
-        if (args.directory / filename).exists():
-            (args.directory / filename).rename(args.directory / "prev" / filename)
+    moved = [filename for filename in ["nii", "qa", json_file.name] if filename in dir_names]
+    for filename in moved:
+        (args.directory / filename).rename(args.directory / "prev" / filename)
     try:
         run_conversion(
             type_dir,
@@ -276,11 +290,11 @@ def update(args: Optional[List[str]] = None) -> None:
         logging.info("Exception caught during update. Resetting to previous state.")
         for filename in ["nii", "qa", json_file.name]:
             silentremove(args.directory / filename)
-            if (args.directory / "prev" / filename).exists():
+            if filename in moved:
                 (args.directory / "prev" / filename).rename(args.directory / filename)
     else:
         for dirname in ["stage", "proc"]:
-            if (args.directory / dirname).exists():
+            if dirname in dir_names:
                 (args.directory / dirname / "CHECK").touch()
     silentremove(args.directory / "prev")
 
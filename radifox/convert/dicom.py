@@ -1,5 +1,6 @@
 import logging
 from collections import defaultdict
+import os
 from pathlib import Path
 import shutil
 from typing import Optional
@@ -190,8 +191,10 @@ class DicomSet(BaseSet):
         self.ForceDerived = force_derived
 
         logging.info("Loading DICOMs.")
-        for dcmdir in sorted((output_root / self.Metadata.dir_to_str() / "dcm").glob("*")):
-            ds = dcmread(str(sorted(dcmdir.glob("*"))[0]), stop_before_pixels=True)
+        session_dir = output_root / self.Metadata.dir_to_str()
+        for dcmdir in sorted((session_dir / "dcm").glob("*")):
+            dcm_files = list(dcmdir.glob("*"))
+            ds = dcmread(str(min(dcm_files)), stop_before_pixels=True)
             if ds.SOPClassUID == "1.2.840.10008.5.1.4.1.1.4.1":
                 sfds_dict = defaultdict(list)
                 for sfds in sorted(create_sf_headers(ds), key=lambda x: x.InstanceNumber):
@@ -208,7 +211,7 @@ class DicomSet(BaseSet):
                     )
             else:
                 self.SeriesList.append(
-                    DicomInfo(dcmdir, ds, dcmdir.name, len(list(dcmdir.glob("*"))), False)
+                    DicomInfo(dcmdir, ds, dcmdir.name, len(dcm_files), False)
                 )
 
         study_nums, series_nums = self.get_unique_study_series(self.SeriesList)
@@ -318,13 +321,14 @@ def sort_dicoms(dcm_dir: Path, force_dicom: bool = False) -> None:
                 output_dir / dcm_file.name
             )
 
-    new_dirs = list(new_series_uids.values())
-    for item in dcm_dir.glob("*"):
-        if item.name not in new_dirs:
-            if item.is_dir():
-                shutil.rmtree(item)
-            elif item.is_file():
-                item.unlink()
+    new_dirs = set(new_series_uids.values())
+    with os.scandir(dcm_dir) as entries:
+        leftovers = [entry for entry in entries if entry.name not in new_dirs]
+    for entry in leftovers:
+        if entry.is_dir():
+            shutil.rmtree(entry.path)
+        elif entry.is_file():
+            os.unlink(entry.path)
 
     logging.info("Checking for duplicate DICOM files")
     for uid in inst_nums:
@@ -137,7 +137,8 @@ class ParrecSet(BaseSet):
         self.ManualArgs = manual_args
 
         logging.info("Loading PARRECs.")
-        for parfile in sorted((output_root / self.Metadata.dir_to_str() / "parrec").rglob("*.par")):
+        session_dir = output_root / self.Metadata.dir_to_str()
+        for parfile in sorted((session_dir / "parrec").rglob("*.par")):
             self.SeriesList.append(ParrecInfo(parfile, self.ManualArgs))
 
         study_nums, series_nums = self.get_unique_study_series(self.SeriesList)
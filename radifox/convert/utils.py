@@ -2,6 +2,8 @@ from codecs import BOM_UTF8
 from collections.abc import Sequence
 import csv
 from datetime import datetime, date, time, timedelta
+import hashlib
+import json
 import logging
 import os
 from pathlib import Path
@@ -11,6 +13,7 @@ from subprocess import check_output
 
 import nibabel as nib
 from pydicom.dataset import Dataset, FileDataset, Tag
+from radifox.records.hashing import hash_file_dir
 
 ORIENT_CODES = {"sagittal": "PIL", "coronal": "LIP", "axial": "LPS"}
 
@@ -26,12 +29,13 @@ def copytree_link(source: Path, dest: Path, method: str) -> None:
     else:
         raise ValueError(f"Unsupported copy method: {method}")
     dest.mkdir(parents=True, exist_ok=True)
-    for path in source.glob("*"):
-        if path.is_file():
-            func(path, dest / path.name)
-        elif path.is_dir():
-            (dest / path.name).mkdir()
-            copytree_link(path, dest / path.name, method)
+    with os.scandir(source) as entries:
+        for entry in entries:
+            if entry.is_file():
+                func(entry.path, dest / entry.name)
+            elif entry.is_dir():
+                (dest / entry.name).mkdir()
+                copytree_link(Path(entry.path), dest / entry.name, method)
 
 
 # http://stackoverflow.com/a/10840586
@@ -257,6 +261,37 @@ def get_software_versions() -> dict[str, str]:
     return {"dcm2niix": dcm2niix_version}
 
 
+def source_tree_stats(source: Path) -> list[list]:
+    if source.is_file():
+        stat = source.stat()
+        return [[source.name, stat.st_size, stat.st_mtime_ns]]
+    tree_stats = []
+    for root, dirs, files in os.walk(source, followlinks=True):
+        for name in dirs:
+            tree_stats.append([os.path.relpath(os.path.join(root, name), source), None, None])
+        for name in files:
+            stat = os.stat(os.path.join(root, name))
+            relpath = os.path.relpath(os.path.join(root, name), source)
+            tree_stats.append([relpath, stat.st_size, stat.st_mtime_ns])
+    return sorted(tree_stats, key=lambda x: x[0])
+
+
+def cached_input_hash(source: Path, cache_file: Path) -> str:
+    # Only a digest of the listing is stored so no source names leak into anonymized outputs
+    tree_digest = hashlib.sha256(
+        json.dumps([str(source), source_tree_stats(source)]).encode()
+    ).hexdigest()
+    if cache_file.exists():
+        cache_obj = json.loads(cache_file.read_text())
+        if cache_obj.get("TreeDigest") == tree_digest:
+            logging.info("Source file(s) unchanged, using cached source hash.")
+            return cache_obj["Hash"]
+    input_hash = hash_file_dir(source, False)
+    cache_file.write_text(json.dumps({"TreeDigest": tree_digest, "Hash": input_hash}))
+    cache_file.chmod(FILE_OCTAL)
+    return input_hash
+
+
 def version_check(saved_version: str, current_version: str) -> bool:
     if "dev" in saved_version or "dev" in current_version:
         return False
@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+from radifox.records.hashing import hash_file_dir
+
+from radifox.convert.utils import cached_input_hash, FILE_OCTAL
+
+
+@pytest.fixture
+def source(tmp_path):
+    source_dir = tmp_path / "PATIENT_DOE_JOHN"
+    (source_dir / "series1").mkdir(parents=True)
+    (source_dir / "series1" / "IM0001").write_bytes(b"slice one")
+    (source_dir / "series1" / "IM0002").write_bytes(b"slice two")
+    return source_dir
+
+
+def poison_cache(cache_file):
+    cache_obj = json.loads(cache_file.read_text())
+    cache_obj["Hash"] = "stale"
+    cache_file.write_text(json.dumps(cache_obj))
+
+
+def test_cached_input_hash_hit(source, tmp_path):
+    cache_file = tmp_path / ".radifox_inputhash"
+    assert cached_input_hash(source, cache_file) == hash_file_dir(source, False)
+    poison_cache(cache_file)
+    assert cached_input_hash(source, cache_file) == "stale"
+
+
+def test_cached_input_hash_changed_mtime(source, tmp_path):
+    cache_file = tmp_path / ".radifox_inputhash"
+    cached_input_hash(source, cache_file)
+    poison_cache(cache_file)
+    slice_file = source / "series1" / "IM0001"
+    mtime_ns = slice_file.stat().st_mtime_ns
+    os.utime(slice_file, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+    assert cached_input_hash(source, cache_file) == hash_file_dir(source, False)
+
+
+def test_cached_input_hash_changed_tree(source, tmp_path):
+    cache_file = tmp_path / ".radifox_inputhash"
+    cached_input_hash(source, cache_file)
+    poison_cache(cache_file)
+    (source / "series2").mkdir()
+    input_hash = cached_input_hash(source, cache_file)
+    assert input_hash != "stale"
+    assert input_hash == hash_file_dir(source, False)
+
+
+def test_cached_input_hash_no_identifiers(source, tmp_path):
+    cache_file = tmp_path / ".radifox_inputhash"
+    cached_input_hash(source, cache_file)
+    cache_text = cache_file.read_text()
+    for name in ["PATIENT_DOE_JOHN", "series1", "IM0001"]:
+        assert name not in cache_text
+    assert cache_file.stat().st_mode & 0o777 == FILE_OCTAL